@@ -1,21 +1,26 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+import csv
+import threading
+
+# Open the responses file once per server process and reuse the writer
+@st.cache_resource
+def get_responses_writer():
+    f = open("survey_responses.csv", "a", newline="")
+    writer = csv.writer(f, lineterminator="\n")  # same line endings as pandas to_csv
+    # Write the header only when the file is first created
+    if f.tell() == 0:
+        writer.writerow(["Timestamp", "Question", "Choice"])
+        f.flush()
+    # Sessions run in separate threads, so serialize writes
+    return f, writer, threading.Lock()
 
 # Function to save survey responses
 def save_responses(responses):
-    try:
-        # Load existing responses if available
-        existing_responses = pd.read_csv("survey_responses.csv")
-    except FileNotFoundError:
-        # If the file doesn't exist, create an empty DataFrame
-        existing_responses = pd.DataFrame(columns=["Timestamp", "Question", "Choice"])
-
-    # Append new responses
-    all_responses = pd.concat([existing_responses, responses], ignore_index=True)
-    
-    # Save to CSV
-    all_responses.to_csv("survey_responses.csv", index=False)
+    f, writer, lock = get_responses_writer()
+    with lock:
+        writer.writerows(responses[["Timestamp", "Question", "Choice"]].itertuples(index=False, name=None))
+        f.flush()
 
 # List of questions and choices
 questions = [
@@ -44,10 +49,10 @@ for i, q in enumerate(questions):
 
 # Submit button
 if st.button("Submit Survey"):
-    # Add timestamp to responses
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Add timestamp to responses: naive local time at second resolution,
+    # written as "YYYY-MM-DD HH:MM:SS" like the rows already in the file
     response_df = pd.DataFrame(responses)
-    response_df["Timestamp"] = timestamp
+    response_df["Timestamp"] = pd.Timestamp.now().floor("s")
 
     # Save responses
     save_responses(response_df)
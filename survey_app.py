@@ -0,0 +1,288 @@
+import streamlit as st
+import pandas as pd
+import psycopg2
+from psycopg2 import extensions, sql
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from datetime import datetime  # <-- we need datetime for timestamps
+
+# Answer options for every question; "" is the unanswered default
+ANSWER_OPTIONS = ("", "Yes", "No")
+
+# Survey row columns carried from sampling through to the evaluation table
+SURVEY_COLUMNS = ["id", "content", "headline", "original", "probability", "reward", "beta", "model"]
+
+########################################
+# 1) Database Connection Pool
+########################################
+@st.cache_resource
+def get_pool():
+    """
+    Returns a psycopg2 connection pool using credentials
+    in Streamlit secrets. The pool is cached, so warm connections
+    are shared across reruns, sessions and surveys instead of reconnecting.
+    """
+    return ThreadedConnectionPool(
+        2, 20,
+        dbname=st.secrets["DB_NAME"],
+        user=st.secrets["DB_USER"],
+        password=st.secrets["DB_PASSWORD"],
+        host=st.secrets["DB_HOST"],
+        port=st.secrets["DB_PORT"],
+        sslmode="require",
+        keepalives=1,
+        keepalives_idle=30
+    )
+
+
+def get_healthy_conn(pool):
+    """
+    Returns a connection from the pool that has answered a `SELECT 1`.
+    The pool hands out idle connections without checking them, and after
+    a restart, failover or idle timeout every idle one may be dead, so
+    dead connections are closed until the pool opens a fresh one.
+    """
+    for _ in range(pool.minconn + 1):
+        conn = pool.getconn()  # opens a new connection once no idle one is left
+        try:
+            # Avoid psycopg2's implicit BEGIN/COMMIT round trips; sampling only
+            # reads and the submit manages its own transaction
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Discard the broken connection instead of pooling it again
+            pool.putconn(conn, close=True)
+    raise psycopg2.OperationalError("no live connection to the survey database")
+
+
+def borrow(work):
+    """
+    Runs `work(conn)` on a healthy connection borrowed from the pool and
+    returns its result. `work` runs once and is never retried: the submit
+    is not idempotent, and resending it after a connection lost around
+    its COMMIT would record the answers twice. On failure the respondent
+    is asked to try again; the form keeps their answers.
+    """
+    try:
+        pool = get_pool()
+        conn = get_healthy_conn(pool)
+    except PoolError:
+        # Every connection in the pool is checked out
+        st.error("The survey is busy right now. Please try again in a moment.")
+        st.stop()
+    except psycopg2.OperationalError:
+        # The database refused new connections, or every connection was dead
+        st.error("Could not reach the survey database. Please try again in a moment.")
+        st.stop()
+
+    try:
+        return work(conn)
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        # Lost connection, or a cancelled / rolled back statement
+        st.error("The survey database did not respond. Please try again in a moment.")
+        st.stop()
+    finally:
+        if conn.closed:
+            # psycopg2 marks connections it found broken as closed
+            pool.putconn(conn, close=True)
+        else:
+            # The submit sends its own BEGIN ... COMMIT, so a failure inside
+            # it leaves that explicit transaction open; the pool's rollback()
+            # is a no-op under autocommit, so end it here
+            if conn.info.transaction_status == extensions.TRANSACTION_STATUS_INERROR:
+                with conn.cursor() as cur:
+                    cur.execute("ROLLBACK")
+            pool.putconn(conn)
+
+
+########################################
+# 2) Sampling Logic
+########################################
+def sample_questions(conn, table, n=8):
+    """
+    Sample 'n' rows with status < 8 from `table` directly in the database,
+    keeping one headline per article content, so only the sampled rows are
+    transferred. Rows are drawn with weights proportional to
+    (8 - status) using Efraimidis-Spirakis keys: random()^(1 / weight).
+    """
+    query = sql.SQL("""
+        SELECT id, content, headline, original, probability, reward, beta, model, status
+        FROM (
+            SELECT DISTINCT ON (content)
+                id, content, headline, original, probability, reward, beta, model, status
+            FROM {table}
+            WHERE status < 8
+            ORDER BY content, power(random(), 1.0 / (8 - status)) DESC
+        ) AS per_content
+        ORDER BY power(random(), 1.0 / (8 - status)) DESC
+        LIMIT %s;
+    """).format(table=sql.Identifier(table))
+
+    with conn.cursor() as cur:
+        cur.execute(query, (n,))
+        rows = cur.fetchall()
+
+    # Convert list of tuples into a DataFrame
+    df_sampled = pd.DataFrame(rows, columns=SURVEY_COLUMNS + ["status"])
+    return df_sampled
+
+########################################
+# 3) Main Streamlit App
+########################################
+def run(config):
+    """
+    Runs one headline survey. `config` holds what differs between studies:
+    "survey_table", "evaluation_table", "judgment_column", "instructions",
+    "question" (the radio label) and, optionally, "comments_prompt" to
+    show a comments box; its text is stored in the comment column of the
+    last evaluation row of the submission (NULL on the others).
+    """
+    judgment_column = config["judgment_column"]
+    comments_prompt = config.get("comments_prompt")
+
+    st.title("Evaluating the Headlines")
+
+    # Record the survey start time if not already set
+    if "start_time" not in st.session_state:
+        st.session_state["start_time"] = datetime.now()
+
+    # 1. Sample 8 questions and store them persistently in session_state
+    if "df_questions" not in st.session_state:
+        st.session_state["df_questions"] = borrow(
+            lambda conn: sample_questions(conn, config["survey_table"], n=8)
+        )
+
+    # Get the persisted sampled questions
+    df_questions = st.session_state["df_questions"]
+
+    # If there are no rows to sample, notify the user
+    if df_questions.empty:
+        st.warning("No rows available (all have status >= 8).")
+        return
+
+    # 2. Display the questions
+    st.info(config["instructions"])
+
+
+    # Render all questions in one form: widget changes inside it do not
+    # rerun the script, only the submit button does
+    with st.form("survey"):
+        # Initialize user responses
+        user_responses = []
+        question_rows = df_questions[SURVEY_COLUMNS].itertuples(name=None)  # plain tuples, no per-row Series
+
+        for i, (idx, survey_id, content, headline, original, probability, reward, beta, model) in enumerate(question_rows, start=1):
+            st.markdown(f"Question {i}")
+            st.markdown(f"**Headline:** {headline}")
+            st.markdown(f"**Content:** {content}")
+
+            # Define a unique session state key for each question
+            question_key = f"question_{idx}_{headline}"
+
+            # Render the radio button; its key binds it to the session state
+            st.radio(
+                f"{config['question']} (Question {i})",
+                options=ANSWER_OPTIONS,
+                key=question_key
+            )
+
+            # Append the response to user_responses
+            user_responses.append({
+                "id": survey_id,
+                "content": content,
+                "headline": headline,
+                "original": original,
+                "probability": probability,
+                "reward": reward,
+                "beta": beta,
+                "model": model,
+                judgment_column: st.session_state[question_key],  # Use updated session state
+            })
+
+            # Add a horizontal rule to separate questions
+            st.markdown("---")
+
+        if comments_prompt:
+            # Add a text input field for comments
+            st.markdown("### Comments")
+            st.text_area(
+                comments_prompt,
+                key="user_comments",
+                placeholder="Write your comments here..."
+            )
+
+        submitted = st.form_submit_button("Submit Answers")
+
+    # Validate responses
+    if submitted:
+        if any(resp[judgment_column] == "" for resp in user_responses):
+            st.warning("Please answer all questions before submitting.")
+        else:
+            submission_time = datetime.now()
+
+            # Insert user responses and update statuses in one explicit
+            # transaction (BEGIN; SET LOCAL; WITH ... UPDATE; COMMIT), sent as a
+            # single query string; statuses are matched on the survey row's
+            # integer id. Survey answers can tolerate losing the last few
+            # commits on a crash, so this transaction does not wait for the
+            # WAL flush
+            submit_query = sql.SQL("""
+                BEGIN;
+                SET LOCAL synchronous_commit = off;
+                WITH ins AS (
+                    INSERT INTO {evaluation_table}
+                    ({columns})
+                    VALUES {rows}
+                )
+                UPDATE {survey_table} AS t
+                SET status = t.status + 1
+                WHERE t.id = ANY({ids}::int[]);
+                COMMIT;
+            """)
+            insert_columns = ["content", "headline", "original", "probability", "reward", "beta", "model",
+                              judgment_column, "start_time", "submission_time"]
+            if comments_prompt:
+                insert_columns.append("comment")
+
+            insert_rows = []
+            for i, resp in enumerate(user_responses, start=1):
+                row = (
+                    resp["content"],
+                    resp["headline"],
+                    resp["original"],
+                    resp["probability"],
+                    resp["reward"],
+                    resp["beta"],
+                    resp["model"],
+                    resp[judgment_column],
+                    st.session_state["start_time"],  # Survey start time
+                    submission_time                  # Survey end time
+                )
+                if comments_prompt:
+                    # Store the comments once per submission, on the last record
+                    row += (st.session_state["user_comments"] if i == len(user_responses) else None,)
+                insert_rows.append(row)
+
+            survey_ids = [resp["id"] for resp in user_responses]
+
+            def write_responses(conn):
+                # The four statements go in one query string, so the whole
+                # transaction is one round trip
+                with conn.cursor() as cur:
+                    cur.execute(submit_query.format(
+                        evaluation_table=sql.Identifier(config["evaluation_table"]),
+                        survey_table=sql.Identifier(config["survey_table"]),
+                        columns=sql.SQL(", ").join(map(sql.Identifier, insert_columns)),
+                        rows=sql.SQL(", ").join(map(sql.Literal, insert_rows)),
+                        ids=sql.Literal(survey_ids)  # one ARRAY[...] literal
+                    ))
+
+            borrow(write_responses)
+
+            # Show the completion code only once the answers are stored
+            st.write("**Thank you!**")
+            st.write("The completion code is headline2024")
+
+            # Indicate success
+            st.success("Responses have been recorded! Thank you!")